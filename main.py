@@ -9,23 +9,25 @@ Features:
 - Uses Python + MySQL
 
 Requirements:
-    pip install pandas numpy mysql-connector-python
+    pip install pandas numpy mysql-connector-python orjson
+    pip install numba   (optional, JIT-compiles the severity scan)
 """
 
-import random, datetime, json
+import datetime, json, multiprocessing, os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Any
 import pandas as pd
 import numpy as np
 import mysql.connector
+import orjson
+try:
+    from numba import njit
+except ImportError:  # numba is optional; make_classifier falls back to NumPy closures
+    njit = None
 
-# -----------------------------
-# JSON Encoder for datetime
-# -----------------------------
-class DateTimeEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, (datetime.datetime, pd.Timestamp)):
-            return obj.isoformat(sep=" ", timespec="seconds")
-        return super().default(obj)
+# orjson encodes datetimes and NumPy scalars natively, no custom encoder needed
+SUMMARY_JSON_OPTS = orjson.OPT_INDENT_2 | orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
 
 # -----------------------------
 # DB CONFIG
@@ -80,9 +82,10 @@ CREATE TABLE IF NOT EXISTS readings (
     id BIGINT PRIMARY KEY AUTO_INCREMENT,
     shipment_id INT,
     sensor_id INT,
-    value DOUBLE,
+    value FLOAT,
     unit VARCHAR(16),
     ts DATETIME,
+    INDEX idx_readings_shp_sen_ts (shipment_id, sensor_id, ts),
     FOREIGN KEY (shipment_id) REFERENCES shipments(id) ON DELETE CASCADE,
     FOREIGN KEY (sensor_id) REFERENCES sensors(id) ON DELETE CASCADE
 );
@@ -111,17 +114,27 @@ CREATE TABLE IF NOT EXISTS risk_scores (
 );
 """
 
+# ON DUPLICATE KEY UPDATE, not INSERT IGNORE: connectors before 8.0.32 only batch INSERT INTO
+INSERT_SENSORS_SQL = ("INSERT INTO sensors(sensor_code,sensor_name,sensor_type,unit,metadata) "
+                      "VALUES(%s,%s,%s,%s,%s) ON DUPLICATE KEY UPDATE id=id")
+INSERT_SHIPMENTS_SQL = ("INSERT INTO shipments(shipment_code,origin,destination,created_at) "
+                        "VALUES(%s,%s,%s,%s) ON DUPLICATE KEY UPDATE id=id")
+INSERT_READINGS_SQL = "INSERT INTO readings(shipment_id,sensor_id,value,unit,ts) VALUES(%s,%s,%s,%s,%s)"
+INSERT_RISK_SQL = "INSERT INTO risk_scores(shipment_id,score,category,details) VALUES(%s,%s,%s,%s)"
+
 # -----------------------------
 # DB Helpers
 # -----------------------------
 def get_db_connection():
     cfg = DB_CONFIG.copy()
     dbname = cfg.pop("database")
-    conn = mysql.connector.connect(**cfg)
+    # C extension rewrites executemany INSERTs into a single multi-VALUES statement
+    conn = mysql.connector.connect(**cfg, use_pure=False, autocommit=False)
     cur = conn.cursor()
     cur.execute(f"CREATE DATABASE IF NOT EXISTS {dbname}")
-    cur.close(); conn.close()
-    return mysql.connector.connect(**DB_CONFIG)
+    cur.close()
+    conn.database = dbname  # USE on the same session instead of a second handshake
+    return conn
 
 def execute_multi_sql(conn, sql):
     cur = conn.cursor()
@@ -129,173 +142,337 @@ def execute_multi_sql(conn, sql):
         if stmt.strip(): cur.execute(stmt)
     conn.commit(); cur.close()
 
+def migrate_readings(conn):
+    # bring an older readings table up to date (FLOAT values, stats index)
+    cur=conn.cursor()
+    cur.execute("SELECT COUNT(*) FROM information_schema.COLUMNS WHERE TABLE_SCHEMA=DATABASE() "
+                "AND TABLE_NAME='readings' AND COLUMN_NAME='value' AND DATA_TYPE<>'float'")
+    if cur.fetchone()[0]: cur.execute("ALTER TABLE readings MODIFY value FLOAT")
+    cur.execute("SELECT COUNT(*) FROM information_schema.STATISTICS WHERE TABLE_SCHEMA=DATABASE() "
+                "AND TABLE_NAME='readings' AND INDEX_NAME='idx_readings_shp_sen_ts'")
+    if not cur.fetchone()[0]: cur.execute("CREATE INDEX idx_readings_shp_sen_ts ON readings(shipment_id, sensor_id, ts)")
+    cur.close()
+
+def in_placeholders(values):
+    return "(" + ",".join(["%s"]*len(values)) + ")"
+
+READING_DTYPES={"shipment_id":np.int32,"sensor_code":"category","value":np.float32,"ts":"datetime64[ns]"}
+
+# Per shipment/sensor stats computed by MySQL over idx_readings_shp_sen_ts
+SENSOR_STATS_SQL = """SELECT r.shipment_id, s.sensor_code, AVG(r.value), MIN(r.value), MAX(r.value)
+FROM readings r JOIN sensors s ON r.sensor_id=s.id
+WHERE r.shipment_id IN {ids}
+GROUP BY r.shipment_id, s.sensor_code
+ORDER BY r.shipment_id, s.sensor_code"""
+
+# Only readings outside a bound of their sensor's rule (bounds bound from SENSOR_RULES)
+CANDIDATE_READINGS_SQL = """SELECT r.shipment_id, ru.sensor_code, r.value, r.ts
+FROM readings r JOIN ({rules}) ru ON r.sensor_id=ru.id
+WHERE r.shipment_id IN {ids}
+  AND (r.value<ru.low OR r.value>ru.high OR r.value>=ru.spike OR r.value<ru.min_v)"""
+
+def candidate_rules(sensor_map):
+    # one SELECT per sensor for the derived table; bounds that don't apply (+/-inf) bind as NULL
+    sql=" UNION ALL ".join(["SELECT %s AS id, %s AS sensor_code, %s AS low, %s AS high, %s AS spike, %s AS min_v"]*len(sensor_map))
+    params=[]
+    for sc,sensor in sensor_map.items():
+        rule=SENSOR_RULES[sc]
+        params += [sensor["id"],sc]+[b if np.isfinite(b) else None for b in (rule[0],rule[1],rule[3],rule[4])]
+    return sql, params
+
+def fetch_sensor_stats(conn, ship_ids):
+    cur=conn.cursor()
+    cur.execute(SENSOR_STATS_SQL.format(ids=in_placeholders(ship_ids)),ship_ids)
+    stats=pd.DataFrame(cur.fetchall(),columns=["shipment_id","sensor_code","mean","min","max"])
+    cur.close()
+    return stats.astype({"mean":np.float64,"min":np.float64,"max":np.float64})
+
+def fetch_readings(conn, ship_ids, sensor_map, batch=10_000):
+    # fetchmany batches straight into typed NumPy columns
+    cur=conn.cursor(buffered=False)
+    rules,params=candidate_rules(sensor_map)
+    cur.execute(CANDIDATE_READINGS_SQL.format(rules=rules,ids=in_placeholders(ship_ids)),params+ship_ids)
+    chunks={k:[] for k in READING_DTYPES}
+    while rows := cur.fetchmany(batch):
+        for k,col in zip(READING_DTYPES,zip(*rows)):
+            chunks[k].append(np.array(col,dtype=object if k=="sensor_code" else READING_DTYPES[k]))
+    cur.close()
+    df=pd.DataFrame({k:np.concatenate(v) if v else np.empty(0,dtype=object) for k,v in chunks.items()})
+    # only a handful of distinct sensor codes: category lets groupby work on the integer codes
+    return df.astype(READING_DTYPES)
+
 # -----------------------------
 # Sample Data Generation
 # -----------------------------
+# One seeded generator and one clock read for the whole sample run
+SAMPLE_SEED = 42
+RNG = np.random.default_rng(SAMPLE_SEED)
+NOW_TS = np.datetime64(datetime.datetime.utcnow(), "ns")
+BASE_TS = NOW_TS - np.timedelta64(6,"h")
+
 def create_sample_shipments(n=5):
-    now = datetime.datetime.utcnow()
+    origins = RNG.choice(["Mumbai","Delhi","Kolkata","Bengaluru"], n).tolist()
+    destinations = RNG.choice(["Chennai","Hyderabad","Pune","Ahmedabad"], n).tolist()
+    created = (NOW_TS - np.arange(n)*np.timedelta64(1,"D")).astype("datetime64[s]").tolist()
     return [{"shipment_code": f"SHP-{100+i}",
-             "origin": random.choice(["Mumbai","Delhi","Kolkata","Bengaluru"]),
-             "destination": random.choice(["Chennai","Hyderabad","Pune","Ahmedabad"]),
-             "created_at": now - datetime.timedelta(days=i)} for i in range(n)]
+             "origin": origins[i],
+             "destination": destinations[i],
+             "created_at": created[i]} for i in range(n)]
+
+def core_temperature_values(n):
+    vals=RNG.normal(5,1,n); spike=RNG.random(n)<0.1
+    vals[spike]+=RNG.choice([-3,3],spike.sum())
+    return vals
+
+def shock_values(n):
+    vals=RNG.uniform(0,0.4,n); spike=RNG.random(n)<0.05
+    vals[spike]=RNG.uniform(2,5,spike.sum())
+    return vals
+
+def battery_values(n):
+    vals=RNG.uniform(3.2,4.1,n); dip=RNG.random(n)<0.05
+    vals[dip]=RNG.uniform(2.8,3.1,dip.sum())
+    return vals
+
+READING_GENERATORS={"core_temperature":core_temperature_values,
+                    "surface_temperature":lambda n: RNG.normal(5,1.5,n),
+                    "humidity":lambda n: RNG.normal(45,5,n),
+                    "shock":shock_values,
+                    "gps":lambda n: RNG.uniform(0,3,n),
+                    "battery_voltage":battery_values}
 
 def generate_readings_for_shipment(ship_id, sensors, n=12):
-    base = datetime.datetime.utcnow() - datetime.timedelta(hours=6)
-    rows = []
+    # columns (SoA) rather than one dict per reading; missing readings are NaN
+    ts = BASE_TS + np.arange(n)*np.timedelta64(5,"m")
+    sensor_ids, units, values = [], [], []
     for s in sensors:
-        for i in range(n):
-            ts = base + datetime.timedelta(minutes=5*i)
-            v=None; t=s["sensor_type"]; m=s["metadata"]
-            if t=="core_temperature": v=random.gauss(5,1);  v += random.choice([-3,3]) if random.random()<0.1 else 0
-            elif t=="surface_temperature": v=random.gauss(5,1.5)
-            elif t=="humidity": v=random.gauss(45,5)
-            elif t=="shock": v=random.uniform(0,0.4); v=random.uniform(2,5) if random.random()<0.05 else v
-            elif t=="gps": v=random.uniform(0,3)
-            elif t=="battery_voltage": v=random.uniform(3.2,4.1); v=random.uniform(2.8,3.1) if random.random()<0.05 else v
-            if random.random()<0.03: v=None
-            rows.append({"shipment_id":ship_id,"sensor_code":s["sensor_code"],"value":v,"unit":s["unit"],"ts":ts})
-    return rows
+        gen=READING_GENERATORS.get(s["sensor_type"])
+        vals=gen(n) if gen else np.full(n,np.nan)
+        vals[RNG.random(n)<0.03]=np.nan
+        sensor_ids.append(s["id"]); units.append(s["unit"]); values.append(vals)
+    return {"shipment_id":np.full(n*len(sensor_ids),ship_id,dtype=np.int32),
+            "sensor_id":np.repeat(np.asarray(sensor_ids,dtype=np.int32),n),
+            "value":np.concatenate(values),
+            "unit":np.repeat(units,n),
+            "ts":np.tile(ts,len(sensor_ids))}
+
+def concat_readings(parts):
+    return {k:np.concatenate([p[k] for p in parts]) for k in parts[0]}
+
+def reading_rows(cols):
+    # NaN -> NULL and datetime64 -> datetime conversions happen here, at the DB boundary
+    value=cols["value"].astype(object); value[np.isnan(cols["value"])]=None
+    return list(zip(cols["shipment_id"].tolist(),cols["sensor_id"].tolist(),value.tolist(),
+                    cols["unit"].tolist(),cols["ts"].astype("datetime64[s]").tolist()))
 
 # -----------------------------
 # Violation & Risk Logic
 # -----------------------------
-def severity_for(meta, value, stype):
-    if value is None: return "normal"
-    if stype in ["core_temperature","surface_temperature","humidity"]:
-        low,high=meta["ideal_low"],meta["ideal_high"]
-        if value<low or value>high:
-            return "critical" if abs(value-(low if value<low else high))>meta.get("warning_margin",1) else "warning"
-    if stype=="shock": return "critical" if value>=meta.get("spike_threshold",2) else "normal"
-    if stype=="battery_voltage": return "warning" if value<meta.get("min_voltage",3.3) else "normal"
-    return "normal"
-
-def detect_violations(df, meta):
-    out=[]
-    for sc,grp in df.groupby("sensor_code"):
-        m=meta[sc]["metadata"]; st=meta[sc]["sensor_type"]
-        for ts,v in zip(grp["ts"],grp["value"]):
-            if v is None:
-                out.append({"sensor_code":sc,"type":"missing","severity":"warning","message":"Missing reading","ts":ts})
-            else:
-                sev=severity_for(m,v,st)
-                if sev!="normal":
-                    out.append({"sensor_code":sc,"type":"threshold","severity":sev,"message":f"{sc} breach: {v}","ts":ts})
+# Severity codes shared by the JIT kernel and the NumPy path
+SEV_NORMAL, SEV_WARNING, SEV_CRITICAL = 0, 1, 2
+SEVERITY_NAMES={SEV_WARNING:"warning",SEV_CRITICAL:"critical"}
+STYPE_BAND, STYPE_SHOCK, STYPE_BATTERY, STYPE_OTHER = 0, 1, 2, 3
+STYPE_CODES={"core_temperature":STYPE_BAND,"surface_temperature":STYPE_BAND,"humidity":STYPE_BAND,
+             "shock":STYPE_SHOCK,"battery_voltage":STYPE_BATTERY}
+
+def rule_params(meta, stype):
+    # (low, high, margin, spike, min_v, code); bounds that don't apply are +/-inf
+    code=STYPE_CODES.get(stype,STYPE_OTHER)
+    low,high,margin=-np.inf,np.inf,np.inf
+    if code==STYPE_BAND: low,high,margin=meta["ideal_low"],meta["ideal_high"],meta.get("warning_margin",1)
+    spike=meta.get("spike_threshold",2) if code==STYPE_SHOCK else np.inf
+    min_v=meta.get("min_voltage",3.3) if code==STYPE_BATTERY else -np.inf
+    return float(low),float(high),float(margin),float(spike),float(min_v),code
+
+# Resolved once so the detect pass never touches the metadata dicts
+SENSOR_RULES={s["sensor_code"]:rule_params(s["metadata"],s["sensor_type"]) for s in SENSORS_DEF}
+
+def classify_loop(values, low, high, margin, spike, min_v, code):
+    out=np.zeros(values.shape[0],dtype=np.int8)
+    for i in range(values.shape[0]):
+        v=values[i]
+        if code==STYPE_BAND:
+            if v<low: out[i]=SEV_CRITICAL if low-v>margin else SEV_WARNING
+            elif v>high: out[i]=SEV_CRITICAL if v-high>margin else SEV_WARNING
+        elif code==STYPE_SHOCK:
+            if v>=spike: out[i]=SEV_CRITICAL
+        elif code==STYPE_BATTERY:
+            if v<min_v: out[i]=SEV_WARNING
     return out
 
+# Generic kernel, only ever inlined into the per-sensor kernels built by make_classifier
+classify_njit=njit(inline="always",cache=True,boundscheck=False,fastmath=True)(classify_loop) if njit else None
+
+def make_classifier(rule, dtype=READING_DTYPES["value"]):
+    # one kernel per sensor, constants cast to the readings' dtype
+    cast=np.dtype(dtype).type
+    low,high,margin,spike,min_v=(cast(x) for x in rule[:5]); code=rule[5]
+    if classify_njit is not None:
+        # closure constants are frozen at compile time, unused branches fold away
+        @njit(cache=True,boundscheck=False,fastmath=True)
+        def kernel(values):
+            return classify_njit(values,low,high,margin,spike,min_v,code)
+    elif code==STYPE_BAND:
+        cut=max(margin,cast(0))  # critical needs a breach, so dist > max(0, margin)
+        def kernel(values):
+            dist=np.maximum(low-values,values-high)  # > 0 only outside [low, high]
+            return (dist>0).astype(np.int8)+(dist>cut).astype(np.int8)
+    elif code==STYPE_SHOCK:
+        def kernel(values):
+            return 2*(values>=spike).astype(np.int8)
+    elif code==STYPE_BATTERY:
+        def kernel(values):
+            return (values<min_v).astype(np.int8)
+    else:
+        def kernel(values):
+            return np.zeros(values.shape[0],dtype=np.int8)
+    def classify(values):
+        # read-only contiguous view: one JIT signature whatever pandas hands over
+        values=np.ascontiguousarray(values,dtype=dtype).view(); values.flags.writeable=False
+        return kernel(values)
+    return classify
+
+SENSOR_CLASSIFIERS={sc:make_classifier(rule) for sc,rule in SENSOR_RULES.items()}
+
+def warm_classifiers(classifiers=SENSOR_CLASSIFIERS):
+    # compile or load every per-sensor kernel before the pool starts
+    empty=np.empty(0,dtype=READING_DTYPES["value"])
+    for classify in classifiers.values(): classify(empty)
+
+def detect_violations(df, classifiers=SENSOR_CLASSIFIERS):
+    # returns the violation records plus a per-sensor (risk, violation count) table
+    out=[]; flags={}
+    for sc,grp in df.groupby("sensor_code",observed=True):
+        vals=grp["value"].to_numpy(); ts=grp["ts"].to_numpy().astype("datetime64[s]")
+        sev=classifiers[sc](vals)
+        flagged=np.flatnonzero(sev!=SEV_NORMAL)
+        # Python work is only done for the flagged rows
+        for i in flagged:
+            out.append({"sensor_code":sc,"type":"threshold","severity":SEVERITY_NAMES[sev[i]],"message":f"{sc} breach: {vals[i]!s}","ts":ts[i].item()})
+        risk="High" if (sev==SEV_CRITICAL).any() else "Medium" if (sev==SEV_WARNING).any() else "Low"
+        flags[sc]=(risk,len(flagged))
+    return out, pd.DataFrame.from_dict(flags,orient="index",columns=["risk","violations"])
+
 def compute_risk(violations):
     score=sum(0.1 if v["severity"]=="warning" else 0.35 if v["severity"]=="critical" else 0 for v in violations)
     return min(1,round(score,3)), "High" if score>0.5 else "Medium" if score>0.2 else "Low"
 
-def sensor_risk(value_list, meta, stype):
-    risk="Low"
-    for v in value_list:
-        sev=severity_for(meta, v, stype)
-        if sev=="critical": return "High"
-        elif sev=="warning": risk="Medium"
-    return risk
+# -----------------------------
+# Per-shipment Report
+# -----------------------------
+def process_shipment(args):
+    # runs in a worker process: no DB access, returns (summary json, encoded violations, text report)
+    sid,code,stats,df,sensor_map=args
+
+    # --- Sensor Stats ---
+    stats=stats.set_index("sensor_code")[["mean","min","max"]].round(2)
+
+    # --- Violations & risk ---
+    viols,sensor_flags=detect_violations(df)
+    score,cat=compute_risk(viols)
+    # encoded once; reused for the risk_scores row and the summary file
+    viols_json=orjson.dumps(viols,option=orjson.OPT_NAIVE_UTC)
+
+    # --- Violations count ---
+    vcount=Counter(v["sensor_code"] for v in viols)
+
+    # --- Text Output ---
+    lines=[f"\nShipment {code} - Sensor Stats:",str(stats),
+           "\nViolations per sensor:",str(pd.Series(vcount,dtype=int)),
+           f"\nShipment {code} Sensor Analysis:"]
+
+    critical_alerts=[]
+    sensor_analysis=[]
+    # sensors without candidate rows have no flags: no violations, Low risk
+    analysis=stats[["mean"]].join(sensor_flags).fillna({"risk":"Low","violations":0}).astype({"violations":int})
+    for row in analysis.itertuples():
+        sc=row.Index; sensor=sensor_map[sc]
+        lines.append(f"{sc} ({sensor['sensor_name']}): Avg={row.mean:.2f}{sensor['unit']}, Violations={row.violations} → {row.risk} Risk")
+        sensor_analysis.append({"sensor_code":sc,"sensor_name":sensor['sensor_name'],
+                                "avg": row.mean,
+                                "unit":sensor['unit'],
+                                "violations":int(row.violations),
+                                "risk":row.risk})
+        if row.risk=="High": critical_alerts.append(sensor['sensor_name'])
+
+    if critical_alerts:
+        lines.append(f"Critical Alerts: {', '.join(critical_alerts)}")
+    else:
+        lines.append("Critical Alerts: None")
+    lines.append(f"Overall Shipment Risk Score: {score} ({cat})\n{'-'*50}")
+
+    # --- JSON Output (violations_detail is attached by the caller from viols_json) ---
+    shipment_json={
+        "shipment_code": code,
+        "sensor_stats": stats.reset_index().to_dict(orient="records"),
+        "violations_count": [{"sensor_code":k,"count":c} for k,c in vcount.items()],
+        "sensor_analysis": sensor_analysis,
+        "critical_alerts": critical_alerts,
+        "overall_risk_score": {"score":score,"category":cat},
+    }
+    return shipment_json, viols_json, "\n".join(lines)
 
 # -----------------------------
 # Main Workflow
 # -----------------------------
 def main():
     print("MediSafe Monitoring System - Starting")
-    conn=get_db_connection(); execute_multi_sql(conn,CREATE_SCHEMA_SQL)
+    conn=get_db_connection(); execute_multi_sql(conn,CREATE_SCHEMA_SQL); migrate_readings(conn)
     cur=conn.cursor()
 
-    # Insert sensors
-    sensor_map={}
-    for s in SENSORS_DEF:
-        cur.execute("SELECT id FROM sensors WHERE sensor_code=%s",(s["sensor_code"],))
-        row=cur.fetchone(); sid=row[0] if row else None
-        if not sid:
-            cur.execute("INSERT INTO sensors(sensor_code,sensor_name,sensor_type,unit,metadata) VALUES(%s,%s,%s,%s,%s)",
-                        (s["sensor_code"],s["sensor_name"],s["sensor_type"],s["unit"],json.dumps(s["metadata"])))
-            sid=cur.lastrowid
-        sensor_map[s["sensor_code"]]={"id":sid,**s}
+    # Insert sensors (one batched insert that skips existing codes, then one lookup for the ids)
+    cur.executemany(INSERT_SENSORS_SQL,
+                    [(s["sensor_code"],s["sensor_name"],s["sensor_type"],s["unit"],json.dumps(s["metadata"])) for s in SENSORS_DEF])
+    codes=[s["sensor_code"] for s in SENSORS_DEF]
+    cur.execute(f"SELECT sensor_code,id FROM sensors WHERE sensor_code IN {in_placeholders(codes)}",codes)
+    sensor_ids=dict(cur.fetchall())
+    sensor_map={s["sensor_code"]:{"id":sensor_ids[s["sensor_code"]],**s} for s in SENSORS_DEF}
     conn.commit()
 
     # Shipments
-    ship_map={}
-    for shp in create_sample_shipments():
-        cur.execute("INSERT IGNORE INTO shipments(shipment_code,origin,destination,created_at) VALUES(%s,%s,%s,%s)",
-                    (shp["shipment_code"],shp["origin"],shp["destination"],shp["created_at"]))
-        cur.execute("SELECT id FROM shipments WHERE shipment_code=%s",(shp["shipment_code"],))
-        ship_map[shp["shipment_code"]]=cur.fetchone()[0]
+    shipments=create_sample_shipments()
+    cur.executemany(INSERT_SHIPMENTS_SQL,
+                    [(shp["shipment_code"],shp["origin"],shp["destination"],shp["created_at"]) for shp in shipments])
+    codes=[shp["shipment_code"] for shp in shipments]
+    cur.execute(f"SELECT shipment_code,id FROM shipments WHERE shipment_code IN {in_placeholders(codes)}",codes)
+    ship_ids=dict(cur.fetchall())
+    ship_map={code:ship_ids[code] for code in codes}
     conn.commit()
 
-    # Readings
-    for scode,sid in ship_map.items():
-        for r in generate_readings_for_shipment(sid,SENSORS_DEF):
-            cur.execute("INSERT INTO readings(shipment_id,sensor_id,value,unit,ts) VALUES(%s,%s,%s,%s,%s)",
-                        (r["shipment_id"],sensor_map[r["sensor_code"]]["id"],r["value"],r["unit"],r["ts"]))
+    # Readings (columns concatenated across shipments, one executemany, one commit)
+    readings=concat_readings([generate_readings_for_shipment(sid,sensor_map.values()) for sid in ship_map.values()])
+    cur.executemany(INSERT_READINGS_SQL,reading_rows(readings))
     conn.commit()
     print("Sample data inserted.\n")
 
-    # Reports
-    all_output_json=[]
-    for code,sid in ship_map.items():
-        cur.execute("""SELECT s.sensor_code, r.value, r.ts
-                       FROM readings r JOIN sensors s ON r.sensor_id=s.id
-                       WHERE r.shipment_id=%s""",(sid,))
-        df=pd.DataFrame(cur.fetchall(),columns=["sensor_code","value","ts"])
-
-        # --- Sensor Stats ---
-        stats=df.groupby("sensor_code")["value"].agg(["mean","min","max"]).round(2)
-
-        # --- Violations & risk ---
-        viols=detect_violations(df,sensor_map)
-        score,cat=compute_risk(viols)
-        cur.execute("INSERT INTO risk_scores(shipment_id,score,category,details) VALUES(%s,%s,%s,%s)",
-                    (sid,score,cat,json.dumps({"violations":viols},cls=DateTimeEncoder)))
-        conn.commit()
-
-        # --- Violations count ---
-        vcount=pd.DataFrame(viols).groupby("sensor_code").size() if viols else pd.Series(dtype=int)
-
-        # --- Text Output ---
-        print(f"\nShipment {code} - Sensor Stats:")
-        print(stats)
-        print("\nViolations per sensor:")
-        print(vcount)
-        print(f"\nShipment {code} Sensor Analysis:")
-
-        critical_alerts=[]
-        sensor_analysis=[]
-        for sc in df["sensor_code"].unique():
-            values=df[df["sensor_code"]==sc]["value"].tolist()
-            meta=sensor_map[sc]["metadata"]
-            stype=sensor_map[sc]["sensor_type"]
-            srisk=sensor_risk(values,meta,stype)
-            vnum=len([v for v in viols if v["sensor_code"]==sc])
-            print(f"{sc} ({sensor_map[sc]['sensor_name']}): Avg={np.nanmean(values):.2f}{sensor_map[sc]['unit']}, Violations={vnum} → {srisk} Risk")
-            sensor_analysis.append({"sensor_code":sc,"sensor_name":sensor_map[sc]['sensor_name'],
-                                    "avg": round(np.nanmean(values),2),
-                                    "unit":sensor_map[sc]['unit'],
-                                    "violations":vnum,
-                                    "risk":srisk})
-            if srisk=="High": critical_alerts.append(sensor_map[sc]['sensor_name'])
-
-        if critical_alerts:
-            print(f"Critical Alerts: {', '.join(critical_alerts)}")
-        else:
-            print("Critical Alerts: None")
-        print(f"Overall Shipment Risk Score: {score} ({cat})\n{'-'*50}")
-
-        # --- JSON Output ---
-        shipment_json={
-            "shipment_code": code,
-            "sensor_stats": stats.reset_index().to_dict(orient="records"),
-            "violations_count": vcount.reset_index(name="count").to_dict(orient="records"),
-            "sensor_analysis": sensor_analysis,
-            "critical_alerts": critical_alerts,
-            "overall_risk_score": {"score":score,"category":cat},
-            "violations_detail": viols
-        }
+    # Reports (stats aggregated in MySQL, candidate violation rows split per shipment)
+    ship_ids=list(ship_map.values())
+    stats_all=fetch_sensor_stats(conn,ship_ids)
+    df_all=fetch_readings(conn,ship_ids,sensor_map)
+    stats_by={int(sid):stats for sid,stats in stats_all.groupby("shipment_id")}
+    candidates={int(sid):df for sid,df in df_all.groupby("shipment_id")}
+    jobs=[(sid,code,stats_by.get(sid,stats_all.iloc[:0]),candidates.get(sid,df_all.iloc[:0]),sensor_map)
+          for code,sid in ship_map.items()]
+    # map() keeps the printed reports in order; no more workers than jobs
+    warm_classifiers()
+    # fork where available, so workers inherit the warmed kernels
+    ctx=multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+    with ProcessPoolExecutor(max_workers=max(1,min(len(jobs),os.cpu_count() or 1)),mp_context=ctx) as pool:
+        results=list(pool.map(process_shipment,jobs))
+
+    all_output_json=[]; risk_rows=[]
+    for (sid,*_),(shipment_json,viols_json,report) in zip(jobs,results):
+        print(report)
+        risk=shipment_json["overall_risk_score"]
+        risk_rows.append((sid,risk["score"],risk["category"],(b'{"violations":'+viols_json+b'}').decode()))
+        shipment_json["violations_detail"]=orjson.Fragment(viols_json)
         all_output_json.append(shipment_json)
+    cur.executemany(INSERT_RISK_SQL,risk_rows)
+    conn.commit()
 
     # Save JSON to file
-    with open("shipment_summary.json","w") as f:
-        json.dump(all_output_json,f,cls=DateTimeEncoder,indent=4)
+    with open("shipment_summary.json","wb") as f:
+        f.write(orjson.dumps(all_output_json,option=SUMMARY_JSON_OPTS))
 
     cur.close(); conn.close()
     print("Done. JSON output saved to shipment_summary.json")